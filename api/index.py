@@ -1,22 +1,35 @@
 import os
 import json
+import asyncio
+from contextlib import asynccontextmanager
 from typing import List
 from openai.types.chat.chat_completion_message_param import ChatCompletionMessageParam
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from fastapi import FastAPI, Query
 from fastapi.responses import StreamingResponse
-from openai import OpenAI
+from openai import AsyncOpenAI
 from .utils.prompt import ClientMessage, convert_to_openai_messages
-from .utils.tools import get_current_weather
+from .utils.tools import get_current_weather, get_http_client, close_http_client
 
 
 load_dotenv(".env.local")
 
-app = FastAPI()
 
-client = OpenAI(
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_http_client()
+    yield
+    await close_http_client()
+
+
+app = FastAPI(lifespan=lifespan)
+
+client = AsyncOpenAI(
     api_key=os.environ.get("OPENAI_API_KEY"),
+    # Retries 429/5xx/timeouts with exponential backoff and jitter,
+    # honouring any retry-after the API sends.
+    max_retries=3,
 )
 
 
@@ -28,84 +41,82 @@ available_tools = {
     "get_current_weather": get_current_weather,
 }
 
-def do_stream(messages: List[ChatCompletionMessageParam]):
-    stream = client.chat.completions.create(
+async def call_tool(name: str, arguments: str):
+    # Lookup, parsing and binding all happen inside the coroutine, so a bad
+    # call fails when gathered instead of leaving sibling calls unawaited.
+    return await available_tools[name](**json.loads(arguments))
+
+# Built once at import; the schema is static so every request sends the
+# exact same tools payload.
+tool_definitions = [{
+    "type": "function",
+    "function": {
+        "name": "get_current_weather",
+        "description": "Get the current weather at a location",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "latitude": {
+                    "type": "number",
+                    "description": "The latitude of the location",
+                },
+                "longitude": {
+                    "type": "number",
+                    "description": "The longitude of the location",
+                },
+            },
+            "required": ["latitude", "longitude"],
+        },
+    },
+}]
+
+# Data stream protocol line templates, shared by every stream.
+format_text = '0:{text}\n'.format
+format_tool_call = '9:{{"toolCallId":"{id}","toolName":"{name}","args":{args}}}\n'.format
+format_tool_result = 'a:{{"toolCallId":"{id}","toolName":"{name}","args":{args},"result":{result}}}\n'.format
+format_finish = 'e:{{"finishReason":"{reason}","usage":{{"promptTokens":{prompt},"completionTokens":{completion}}},"isContinued":false}}\n'.format
+
+async def do_stream(messages: List[ChatCompletionMessageParam]):
+    stream = await client.chat.completions.create(
         messages=messages,
         model="gpt-4o",
         stream=True,
-        tools=[{
-            "type": "function",
-            "function": {
-                "name": "get_current_weather",
-                "description": "Get the current weather at a location",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "latitude": {
-                            "type": "number",
-                            "description": "The latitude of the location",
-                        },
-                        "longitude": {
-                            "type": "number",
-                            "description": "The longitude of the location",
-                        },
-                    },
-                    "required": ["latitude", "longitude"],
-                },
-            },
-        }]
+        tools=tool_definitions
     )
 
     return stream
 
-def stream_text(messages: List[ChatCompletionMessageParam], protocol: str = 'data'):
+async def stream_text(messages: List[ChatCompletionMessageParam], protocol: str = 'data'):
     draft_tool_calls = []
     draft_tool_calls_index = -1
 
-    stream = client.chat.completions.create(
+    stream = await client.chat.completions.create(
         messages=messages,
         model="gpt-4o",
         stream=True,
-        tools=[{
-            "type": "function",
-            "function": {
-                "name": "get_current_weather",
-                "description": "Get the current weather at a location",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "latitude": {
-                            "type": "number",
-                            "description": "The latitude of the location",
-                        },
-                        "longitude": {
-                            "type": "number",
-                            "description": "The longitude of the location",
-                        },
-                    },
-                    "required": ["latitude", "longitude"],
-                },
-            },
-        }]
+        tools=tool_definitions
     )
 
-    for chunk in stream:
+    async for chunk in stream:
         for choice in chunk.choices:
             if choice.finish_reason == "stop":
                 continue
 
             elif choice.finish_reason == "tool_calls":
                 for tool_call in draft_tool_calls:
-                    yield '9:{{"toolCallId":"{id}","toolName":"{name}","args":{args}}}\n'.format(
+                    yield format_tool_call(
                         id=tool_call["id"],
                         name=tool_call["name"],
                         args=tool_call["arguments"])
 
-                for tool_call in draft_tool_calls:
-                    tool_result = available_tools[tool_call["name"]](
-                        **json.loads(tool_call["arguments"]))
+                # Tool calls are independent I/O, so run them concurrently.
+                tool_results = await asyncio.gather(*[
+                    call_tool(tool_call["name"], tool_call["arguments"])
+                    for tool_call in draft_tool_calls
+                ])
 
-                    yield 'a:{{"toolCallId":"{id}","toolName":"{name}","args":{args},"result":{result}}}\n'.format(
+                for tool_call, tool_result in zip(draft_tool_calls, tool_results):
+                    yield format_tool_result(
                         id=tool_call["id"],
                         name=tool_call["name"],
                         args=tool_call["arguments"],
@@ -126,14 +137,14 @@ def stream_text(messages: List[ChatCompletionMessageParam], protocol: str = 'dat
                         draft_tool_calls[draft_tool_calls_index]["arguments"] += arguments
 
             else:
-                yield '0:{text}\n'.format(text=json.dumps(choice.delta.content))
+                yield format_text(text=json.dumps(choice.delta.content))
 
         if chunk.choices == []:
             usage = chunk.usage
             prompt_tokens = usage.prompt_tokens
             completion_tokens = usage.completion_tokens
 
-            yield 'e:{{"finishReason":"{reason}","usage":{{"promptTokens":{prompt},"completionTokens":{completion}}},"isContinued":false}}\n'.format(
+            yield format_finish(
                 reason="tool-calls" if len(
                     draft_tool_calls) > 0 else "stop",
                 prompt=prompt_tokens,
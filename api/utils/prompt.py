@@ -29,57 +29,51 @@ def convert_to_openai_messages(messages: List[ClientMessage]) -> List[ChatComple
     openai_messages = []
 
     for message in messages:
-        parts = []
-        tool_calls = []
-
-        parts.append({
+        parts = [{
             'type': 'text',
             'text': message.content
-        })
-
-        if (message.experimental_attachments):
-            for attachment in message.experimental_attachments:
-                if (attachment.contentType.startswith('image')):
-                    parts.append({
-                        'type': 'image_url',
-                        'image_url': {
-                            'url': attachment.url
-                        }
-                    })
+        }]
+        tool_calls = []
+        tool_messages = []
 
-                elif (attachment.contentType.startswith('text')):
-                    parts.append({
-                        'type': 'text',
-                        'text': attachment.url
-                    })
+        for attachment in message.experimental_attachments or ():
+            content_type = attachment.contentType
 
-        if(message.toolInvocations):
-            for toolInvocation in message.toolInvocations:
-                tool_calls.append({
-                    "id": toolInvocation.toolCallId,
-                    "type": "function",
-                    "function": {
-                        "name": toolInvocation.toolName,
-                        "arguments": json.dumps(toolInvocation.args)
+            if (content_type.startswith('image')):
+                parts.append({
+                    'type': 'image_url',
+                    'image_url': {
+                        'url': attachment.url
                     }
                 })
 
-        tool_calls_dict = {"tool_calls": tool_calls} if tool_calls else {"tool_calls": None}
+            elif (content_type.startswith('text')):
+                parts.append({
+                    'type': 'text',
+                    'text': attachment.url
+                })
+
+        for toolInvocation in message.toolInvocations or ():
+            tool_calls.append({
+                "id": toolInvocation.toolCallId,
+                "type": "function",
+                "function": {
+                    "name": toolInvocation.toolName,
+                    "arguments": json.dumps(toolInvocation.args)
+                }
+            })
+
+            tool_messages.append({
+                "role": "tool",
+                "tool_call_id": toolInvocation.toolCallId,
+                "content": json.dumps(toolInvocation.result),
+            })
 
         openai_messages.append({
             "role": message.role,
             "content": parts,
-            **tool_calls_dict,
+            "tool_calls": tool_calls or None,
         })
-
-        if(message.toolInvocations):
-            for toolInvocation in message.toolInvocations:
-                tool_message = {
-                    "role": "tool",
-                    "tool_call_id": toolInvocation.toolCallId,
-                    "content": json.dumps(toolInvocation.result),
-                }
-
-                openai_messages.append(tool_message)
+        openai_messages.extend(tool_messages)
 
     return openai_messages
@@ -1,20 +1,90 @@
-import requests
+import time
+import logging
+import httpx
 
-def get_current_weather(latitude, longitude):
-    # Format the URL with proper parameter substitution
-    url = f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&current=temperature_2m&hourly=temperature_2m&daily=sunrise,sunset&timezone=auto"
+logger = logging.getLogger(__name__)
+
+# Shared across calls so repeat lookups reuse the keep-alive connection to
+# open-meteo instead of paying a fresh TCP+TLS handshake each time. Opened
+# and closed by the app lifespan, and recreated lazily if a call lands
+# outside of it.
+http_client = None
+
+def get_http_client():
+    global http_client
+
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            timeout=10,
+            # Limits must go on the transport; the client ignores its own
+            # when an explicit transport is given.
+            transport=httpx.AsyncHTTPTransport(
+                retries=2, limits=httpx.Limits(max_keepalive_connections=20)),
+        )
+
+    return http_client
+
+async def close_http_client():
+    global http_client
+
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+# Open-meteo refreshes current conditions every 15 minutes and returns the
+# same forecast for nearby points. Responses are cached per ~1km grid cell
+# for 10 minutes, shorter than that interval, so a cached answer is never
+# more than one refresh behind.
+WEATHER_CACHE_TTL = 600
+WEATHER_CACHE_MAX_SIZE = 4096
+
+weather_cache = {}
+
+async def get_current_weather(latitude, longitude):
+    # Arguments come from model-generated JSON and may arrive as strings.
+    try:
+        latitude = round(float(latitude), 2)
+        longitude = round(float(longitude), 2)
+    except (TypeError, ValueError) as e:
+        logger.warning("Invalid coordinates for weather lookup: %s", e)
+        return None
+
+    key = (latitude, longitude)
+
+    now = time.monotonic()
+    cached = weather_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    url = "https://api.open-meteo.com/v1/forecast"
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "current": "temperature_2m",
+        "hourly": "temperature_2m",
+        "daily": "sunrise,sunset",
+        "timezone": "auto",
+    }
 
     try:
         # Make the API call
-        response = requests.get(url)
+        response = await get_http_client().get(url, params=params)
 
         # Raise an exception for bad status codes
         response.raise_for_status()
 
-        # Return the JSON response
-        return response.json()
+        weather = response.json()
 
-    except requests.RequestException as e:
+    # ValueError covers a non-JSON body on an otherwise successful response.
+    except (httpx.HTTPError, ValueError) as e:
         # Handle any errors that occur during the request
-        print(f"Error fetching weather data: {e}")
+        logger.warning("Error fetching weather data: %s", e)
         return None
+
+    # Drop the oldest entry once full; dicts keep insertion order.
+    weather_cache.pop(key, None)
+    if len(weather_cache) >= WEATHER_CACHE_MAX_SIZE:
+        del weather_cache[next(iter(weather_cache))]
+    weather_cache[key] = (now + WEATHER_CACHE_TTL, weather)
+
+    return weather
@@ -0,0 +1,121 @@
+import os
+import gc
+import json
+import asyncio
+import unittest
+import warnings
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from api import index
+from api.utils import tools
+
+
+def tool_call_delta(id=None, name=None, arguments=""):
+    return SimpleNamespace(
+        id=id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def chunk(finish_reason=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(
+        finish_reason=finish_reason,
+        delta=SimpleNamespace(tool_calls=tool_calls, content=None))])
+
+
+def tool_call_stream(*arguments):
+    chunks = []
+    for i, args in enumerate(arguments):
+        chunks.append(chunk(tool_calls=[tool_call_delta(
+            id=f"call_{i}", name="get_current_weather")]))
+        chunks.append(chunk(tool_calls=[tool_call_delta(arguments=args)]))
+    chunks.append(chunk(finish_reason="tool_calls"))
+
+    async def stream():
+        for c in chunks:
+            yield c
+
+    return stream()
+
+
+class StreamTextTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            latitude = request.url.params["latitude"]
+            return httpx.Response(200, json={"latitude": float(latitude)})
+
+        tools.weather_cache.clear()
+        tools.http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+
+        self.create = AsyncMock()
+        client_patch = patch.object(index, "client", SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=self.create))))
+        client_patch.start()
+        self.addCleanup(client_patch.stop)
+
+    async def asyncTearDown(self):
+        await tools.close_http_client()
+        tools.weather_cache.clear()
+
+    async def collect(self):
+        return [line async for line in index.stream_text([])]
+
+    async def test_tool_results_are_streamed_in_call_order(self):
+        self.create.return_value = tool_call_stream(
+            '{"latitude": 1, "longitude": 1}',
+            '{"latitude": 2, "longitude": 2}')
+
+        lines = await self.collect()
+
+        self.assertEqual([line[:2] for line in lines], ["9:", "9:", "a:", "a:"])
+        results = [json.loads(line[2:]) for line in lines[2:]]
+        self.assertEqual([r["toolCallId"] for r in results], ["call_0", "call_1"])
+        self.assertEqual([r["result"] for r in results],
+                         [{"latitude": 1.0}, {"latitude": 2.0}])
+
+    async def test_tool_calls_run_concurrently(self):
+        second_started = asyncio.Event()
+
+        async def tool(order):
+            if order == 1:
+                # Only completes if the second call starts while this waits.
+                await asyncio.wait_for(second_started.wait(), timeout=1)
+                return "first"
+            second_started.set()
+            return "second"
+
+        self.create.return_value = tool_call_stream(
+            '{"order": 1}', '{"order": 2}')
+        tools_patch = patch.dict(
+            index.available_tools, {"get_current_weather": tool})
+        tools_patch.start()
+        self.addCleanup(tools_patch.stop)
+
+        lines = await self.collect()
+
+        self.assertEqual([json.loads(line[2:])["result"] for line in lines[2:]],
+                         ["first", "second"])
+
+    async def test_bad_arguments_leave_no_unawaited_calls(self):
+        self.create.return_value = tool_call_stream(
+            '{"latitude": 1, "longitude": 1}', '{"location": "x"}')
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with self.assertRaises(TypeError):
+                await self.collect()
+            gc.collect()
+
+        self.assertEqual(
+            [w for w in caught if issubclass(w.category, RuntimeWarning)], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from api.utils import tools
+
+
+class GetCurrentWeatherTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.requests = []
+        self.body = b'{"current": {"temperature_2m": 20.5}}'
+
+        def handler(request):
+            self.requests.append(request)
+            return httpx.Response(200, content=self.body)
+
+        tools.weather_cache.clear()
+        tools.http_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler))
+
+        time_patch = patch("api.utils.tools.time")
+        self.time = time_patch.start()
+        self.addCleanup(time_patch.stop)
+        self.time.monotonic.return_value = 1000.0
+
+    async def asyncTearDown(self):
+        await tools.close_http_client()
+        tools.weather_cache.clear()
+
+    async def test_rounds_coordinates_and_accepts_numeric_strings(self):
+        weather = await tools.get_current_weather("40.71284", "-74.00601")
+
+        self.assertEqual(weather, {"current": {"temperature_2m": 20.5}})
+        self.assertEqual(self.requests[0].url.params["latitude"], "40.71")
+        self.assertEqual(self.requests[0].url.params["longitude"], "-74.01")
+
+    async def test_invalid_coordinates_return_none(self):
+        self.assertIsNone(await tools.get_current_weather("north", 1.0))
+        self.assertIsNone(await tools.get_current_weather(None, 1.0))
+        self.assertEqual(self.requests, [])
+
+    async def test_nearby_coordinates_share_a_cached_response(self):
+        await tools.get_current_weather(40.711, -74.001)
+        await tools.get_current_weather(40.712, -74.004)
+
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_cached_response_expires_after_ttl(self):
+        await tools.get_current_weather(40.71, -74.0)
+
+        self.time.monotonic.return_value = 1000.0 + tools.WEATHER_CACHE_TTL - 1
+        await tools.get_current_weather(40.71, -74.0)
+        self.assertEqual(len(self.requests), 1)
+
+        self.time.monotonic.return_value = 1000.0 + tools.WEATHER_CACHE_TTL
+        await tools.get_current_weather(40.71, -74.0)
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_oldest_entry_is_evicted_when_full(self):
+        with patch.object(tools, "WEATHER_CACHE_MAX_SIZE", 2):
+            await tools.get_current_weather(1.0, 1.0)
+            await tools.get_current_weather(2.0, 2.0)
+            await tools.get_current_weather(3.0, 3.0)
+
+        self.assertEqual(list(tools.weather_cache), [(2.0, 2.0), (3.0, 3.0)])
+
+    async def test_refetched_entry_moves_to_newest(self):
+        with patch.object(tools, "WEATHER_CACHE_MAX_SIZE", 2):
+            await tools.get_current_weather(1.0, 1.0)
+            await tools.get_current_weather(2.0, 2.0)
+
+            self.time.monotonic.return_value = 1000.0 + tools.WEATHER_CACHE_TTL
+            await tools.get_current_weather(1.0, 1.0)
+            await tools.get_current_weather(3.0, 3.0)
+
+        self.assertEqual(list(tools.weather_cache), [(1.0, 1.0), (3.0, 3.0)])
+
+    async def test_non_json_body_returns_none_and_is_not_cached(self):
+        self.body = b"<html>upstream error</html>"
+
+        self.assertIsNone(await tools.get_current_weather(40.71, -74.0))
+        self.assertEqual(tools.weather_cache, {})
+
+
+if __name__ == "__main__":
+    unittest.main()